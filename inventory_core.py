@@ -0,0 +1,325 @@
+"""Funciones compartidas de carga, limpieza, clasificación ABC y políticas.
+
+Ambas apps Streamlit importan de aquí: al vivir las funciones en un solo
+módulo, la memoización de @st.cache_data se comparte entre entrypoints
+(Streamlit cachea por nombre calificado de función, así que dos copias
+idénticas no compartirían entradas de caché).
+"""
+
+import hashlib
+import io
+import random
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import gspread
+import xlsxwriter
+from google.oauth2.service_account import Credentials
+from scipy.stats import norm
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+DAY_PREFIX = "Dia_"
+CACHE_DIR = Path(".cache")
+
+# ------------------------------
+# CARGA DE DATOS
+# ------------------------------
+
+
+@st.cache_resource
+def get_gspread_client():
+    """Cliente gspread autorizado una sola vez por sesión del servidor."""
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=SCOPES
+    )
+    return gspread.authorize(creds)
+
+
+def _snapshot_path(sheet_url, worksheet_name):
+    key = hashlib.md5(f"{sheet_url}|{worksheet_name}".encode()).hexdigest()
+    return CACHE_DIR / f"sheet_{key}.parquet"
+
+
+def _batch_get_with_retry(sh, ranges, max_attempts=5):
+    """batchGet con backoff exponencial + jitter ante 429 (cuota de la API)."""
+    for attempt in range(max_attempts):
+        try:
+            return sh.values_batch_get(
+                ranges=ranges,
+                params={"valueRenderOption": "UNFORMATTED_VALUE"},
+            )
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, "status_code", None)
+            if status == 429 and attempt < max_attempts - 1:
+                time.sleep((2 ** attempt) + random.random())
+                continue
+            raise
+
+
+def _values_to_df(data):
+    """Convierte el bloque values de la API en DataFrame.
+
+    La API recorta los blancos finales de cada fila (incluida la cabecera),
+    así que las filas pueden ser más cortas o más largas que la cabecera:
+    se rellenan las cortas y se truncan las largas a su ancho.
+    """
+    if not data:
+        return pd.DataFrame()
+    header = data[0]
+    rows = [r[:len(header)] + [None] * (len(header) - len(r)) for r in data[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+
+@st.cache_data(ttl=300)
+def load_sheet(sheet_url, worksheet_name):
+    """Descarga la hoja completa en una sola llamada batchGet.
+
+    Con UNFORMATTED_VALUE las celdas numéricas llegan como números, así que
+    la limpieza posterior solo toca las columnas que quedaron como texto.
+    Cada descarga exitosa se replica en un Parquet local; si la API falla
+    (red, cuota 429), se sirve esa última copia en lugar de tumbar el panel.
+    """
+    snapshot = _snapshot_path(sheet_url, worksheet_name)
+    try:
+        gc = get_gspread_client()
+        sh = gc.open_by_url(sheet_url)
+        resp = _batch_get_with_retry(sh, [f"{worksheet_name}!A:ZZ"])
+        df = _values_to_df(resp["valueRanges"][0].get("values", []))
+        if df.empty:
+            return df
+    except Exception:
+        if snapshot.exists():
+            st.warning("No se pudo actualizar desde Google Sheets; usando la última copia local.")
+            return pd.read_parquet(snapshot)
+        raise
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        # La API entrega las celdas en blanco como "", lo que deja columnas
+        # numéricas como object mixto int/str y hace que pyarrow rechace la
+        # escritura; se normalizan a nulos antes de serializar.
+        df.replace("", None).to_parquet(snapshot)
+    except Exception as e:
+        # El snapshot es solo un respaldo: se sigue sin él, pero avisando,
+        # porque sin snapshot el próximo fallo de la API no tiene a qué caer.
+        st.warning(f"No se pudo escribir el snapshot local ({e}).")
+
+    return df
+
+
+@st.cache_data(ttl=300)
+def load_sheets(sheet_url, worksheet_names):
+    """Descarga varias pestañas del mismo documento en una sola llamada.
+
+    Un batchGet con N rangos cuesta un viaje HTTP en lugar de N; útil para
+    leer por ejemplo la pestaña de productos junto con la de stock.
+    """
+    gc = get_gspread_client()
+    sh = gc.open_by_url(sheet_url)
+    resp = _batch_get_with_retry(sh, [f"{name}!A:ZZ" for name in worksheet_names])
+    return {
+        name: _values_to_df(vr.get("values", []))
+        for name, vr in zip(worksheet_names, resp["valueRanges"])
+    }
+
+
+# ------------------------------
+# LIMPIEZA Y PREPARACIÓN
+# ------------------------------
+
+
+def clean_numeric_columns(df, cols):
+    """Convierte a numérico las columnas dadas que aún son texto, en una pasada."""
+    cols = [c for c in cols if c in df.columns]
+    obj_cols = [c for c in cols if not pd.api.types.is_numeric_dtype(df[c])]
+    if obj_cols:
+        df[obj_cols] = (
+            df[obj_cols]
+            .astype(str)
+            .replace(r"[,\s]", "", regex=True)
+            .apply(pd.to_numeric, errors="coerce")
+        )
+    return df
+
+
+def prepare_df(df_raw, day_prefix=DAY_PREFIX):
+    """Convierte columnas de días y numéricas, y deriva demanda promedio/variación."""
+    day_cols = [c for c in df_raw.columns if c.startswith(day_prefix)]
+
+    numeric_cols = [
+        "costo_unitario",
+        "precio_venta",
+        "Lead_Time_dias",
+        "Stock_actual",
+    ]
+
+    clean_numeric_columns(df_raw, day_cols + numeric_cols)
+
+    # Las ventas diarias son enteros pequeños: float32 basta y reduce a la
+    # mitad la memoria que mueven las reducciones siguientes.
+    df_raw[day_cols] = df_raw[day_cols].fillna(0).astype(np.float32)
+
+    # Una sola extracción de la matriz de días; suma, promedio y desviación
+    # comparten intermedios en lugar de tres escaneos independientes.
+    M = df_raw[day_cols].to_numpy(dtype=np.float32)
+    n_days = M.shape[1]
+    total = M.sum(axis=1)
+    mean = total / n_days
+    var = np.square(M - mean[:, None]).sum(axis=1) / max(1, n_days - 1)
+
+    df_raw["total_mes"] = total
+    df_raw["d_Promedio"] = mean
+    df_raw["Variacion_D"] = np.sqrt(var)
+
+    return df_raw
+
+
+# ------------------------------
+# CLASIFICACIÓN ABC
+# ------------------------------
+
+
+def classify_abc(df, value_col="total_mes", a_pct=0.80, b_pct=0.95):
+    """Ordena por valor descendente y asigna clase A/B/C por porcentaje acumulado."""
+    # searchsorted exige cortes ordenados; con a_pct >= b_pct las clases
+    # saldrían en silencio mal asignadas.
+    if not a_pct < b_pct:
+        raise ValueError(
+            f"El corte de clase A ({a_pct}) debe ser menor que el de clase B ({b_pct})."
+        )
+
+    df_sorted = df.sort_values(value_col, ascending=False).reset_index(drop=True)
+
+    total = df_sorted[value_col].sum()
+    df_sorted["pct"] = df_sorted[value_col] / total
+    df_sorted["pct_acum"] = df_sorted["pct"].cumsum()
+
+    # pct_acum es monótono: una búsqueda binaria vectorizada sobre los cortes
+    # reemplaza una llamada Python por fila. side="left" mantiene los límites
+    # inclusivos (pct_acum == a_pct sigue siendo clase A).
+    idx = np.searchsorted(
+        [a_pct, b_pct], df_sorted["pct_acum"].to_numpy(), side="left"
+    )
+    # Categórica ordenada: ordenar y agrupar por clase pasa a ser trabajo
+    # sobre códigos enteros en lugar de comparar strings.
+    df_sorted["Clase_ABC"] = pd.Categorical.from_codes(
+        idx, categories=["A", "B", "C"], ordered=True
+    )
+
+    # El total ya se calculó para los porcentajes; se expone para que los KPI
+    # no tengan que volver a escanear la columna.
+    df_sorted.attrs["total"] = float(total)
+
+    return df_sorted
+
+
+# ------------------------------
+# POLÍTICAS DE INVENTARIO
+# ------------------------------
+
+
+@lru_cache(maxsize=None)
+def _z_value(service_level):
+    """Memoiza norm.ppf: los niveles de servicio son pocos y se repiten en cada rerun."""
+    return float(norm.ppf(service_level))
+
+
+def compute_policies(df, service_level_A=0.95, service_level_B=0.90,
+                     holding_rate=0.25, ordering_cost=50000.0, review_period=7):
+    """Calcula Q, ROP, SS y S de forma vectorizada según la clase ABC.
+
+    Clase A -> revisión continua (Q, ROP); Clase B -> revisión periódica (S);
+    Clase C queda sin política. Todas las fórmulas operan sobre arreglos
+    completos, sin iterar fila a fila.
+    """
+    df_pols = df.copy()
+
+    zA = _z_value(service_level_A)
+    zB = _z_value(service_level_B)
+
+    d = df_pols["d_Promedio"].to_numpy(dtype=np.float64)
+    sigma = df_pols["Variacion_D"].to_numpy(dtype=np.float64)
+    LT = df_pols["Lead_Time_dias"].to_numpy(dtype=np.float64)
+    cost = df_pols["costo_unitario"].to_numpy(dtype=np.float64)
+    abc = df_pols["Clase_ABC"].to_numpy()
+
+    # EOQ con costo de mantener h = tasa * costo unitario; si h no es válido,
+    # se usa un lote de un mes de demanda como respaldo.
+    h = holding_rate * cost
+    D_anual = d * 365.0
+    Q = np.sqrt(2.0 * D_anual * ordering_cost / np.where(h > 0, h, np.inf))
+    Q = np.where(h > 0, Q, np.maximum(1.0, d * 30.0))
+
+    # Las raíces de lead time se calculan una vez y se reutilizan en SS y en
+    # el punto/nivel de pedido de cada política.
+    sqrt_LT = np.sqrt(np.maximum(1.0, LT))
+    sigma_LT = sigma * sqrt_LT
+    SS_A = np.ceil(zA * sigma_LT)
+    ROP = np.ceil(d * LT + zA * sigma_LT)
+
+    T = float(review_period)
+    sqrt_LTT = np.sqrt(np.maximum(1.0, LT + T))
+    sigma_LTT = sigma * sqrt_LTT
+    SS_B = np.ceil(zB * sigma_LTT)
+    S = np.ceil(d * (LT + T) + zB * sigma_LTT)
+
+    mask_A = abc == "A"
+    mask_B = abc == "B"
+
+    df_pols["Q"] = np.where(mask_A, np.ceil(Q), np.nan)
+    df_pols["ROP"] = np.where(mask_A, ROP, np.nan)
+    df_pols["SS"] = np.where(mask_A, SS_A, np.where(mask_B, SS_B, np.nan))
+    df_pols["S"] = np.where(mask_B, S, np.nan)
+    df_pols["Política"] = np.where(
+        mask_A, "Q (revisión continua)",
+        np.where(mask_B, "P (revisión periódica)", "Sin política (C)")
+    )
+
+    # Pedido sugerido y alerta a partir del stock actual, con máscaras en vez
+    # de excepciones: el stock desconocido (NaN) se resuelve una sola vez.
+    if "Stock_actual" in df_pols.columns:
+        stock = df_pols["Stock_actual"].to_numpy(dtype=np.float64)
+    else:
+        stock = np.full(len(df_pols), np.nan)
+
+    objetivo = np.where(mask_A, ROP, np.where(mask_B, S, np.nan))
+    stock_conocido = ~np.isnan(stock)
+    pedido = np.where(
+        stock_conocido,
+        np.maximum(0.0, objetivo - np.where(stock_conocido, stock, 0.0)),
+        np.nan,
+    )
+
+    df_pols["Pedido_sugerido"] = pedido
+    df_pols["Alerta"] = np.where(
+        ~stock_conocido, "SIN STOCK ACTUAL",
+        np.where(pedido > 0, "PEDIR EN REVISIÓN", "NO PEDIR")
+    )
+
+    return df_pols
+
+
+# ------------------------------
+# EXPORTACIÓN
+# ------------------------------
+
+
+@st.cache_data
+def to_excel_bytes(df_export):
+    # constant_memory hace que xlsxwriter serialice fila a fila en lugar de
+    # retener todo el libro en objetos Python como openpyxl, pero exige
+    # escribir las filas en orden: df.to_excel emite por columnas y las filas
+    # ya volcadas se perderían, así que se escriben con write_row.
+    output = io.BytesIO()
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    ws = wb.add_worksheet("Politicas")
+    ws.write_row(0, 0, [str(c) for c in df_export.columns])
+    for i, row in enumerate(df_export.itertuples(index=False), start=1):
+        ws.write_row(i, 0, [None if pd.isna(v) else v for v in row])
+    wb.close()
+    return output.getvalue()
@@ -5,6 +5,8 @@ import plotly.express as px
 import gspread
 from google.oauth2.service_account import Credentials
 
+from inventory_core import classify_abc, clean_numeric_columns
+
 # ------------------------------
 # CONFIGURACIÓN GENERAL
 # ------------------------------
@@ -77,26 +79,14 @@ if load_button:
             "Stock_actual"
         ]
 
-        for col in numeric_cols:
-            if col in df_raw.columns:
-                df_raw[col] = pd.to_numeric(
-                    df_raw[col].astype(str).str.replace(",", "").str.replace(" ", ""),
-                    errors="coerce"
-                )
+        clean_numeric_columns(df_raw, numeric_cols)
 
         # ------------------------------
         # CLASIFICACIÓN ABC
         # ------------------------------
         df_raw["Valor_anual"] = df_raw["Dinero_Ventas"]
 
-        df = df_raw.sort_values("Valor_anual", ascending=False)
-        df["%"] = df["Valor_anual"] / df["Valor_anual"].sum()
-        df["%_acum"] = df["%"].cumsum()
-
-        df["ABC"] = np.where(
-            df["%_acum"] <= 0.80, "A",
-            np.where(df["%_acum"] <= 0.95, "B", "C")
-        )
+        df = classify_abc(df_raw, value_col="Valor_anual")
 
         # ------------------------------
         # POLÍTICAS DE INVENTARIO
@@ -113,20 +103,22 @@ if load_button:
 
         d_std = df["d_Promedio"].std()
 
-        def calc_politica(row):
-            d = row["d_Promedio"]
-            if row["ABC"] == "A":
-                # Revisión Continua (Q)
-                R = d * L_A + Z_A * d_std
-                return f"Q | R = {R:.1f}"
-            elif row["ABC"] == "B":
-                # Revisión Periódica (P)
-                S = d * (L_B + T_B) + Z_B * d_std
-                return f"P | S = {S:.1f}"
-            else:
-                return "Sin política (C)"
-
-        df["Política"] = df.apply(calc_politica, axis=1)
+        # Revisión Continua (Q) para A, Revisión Periódica (P) para B,
+        # calculadas sobre la columna completa en lugar de fila a fila.
+        d = df["d_Promedio"].to_numpy(dtype=float)
+        R = d * L_A + Z_A * d_std
+        S = d * (L_B + T_B) + Z_B * d_std
+
+        # fillna("nan") replica el f"{nan:.1f}" -> "nan" del antiguo apply;
+        # sin él, astype(str) propaga el NaN y la fila pierde su política.
+        df["Política"] = np.select(
+            [df["Clase_ABC"] == "A", df["Clase_ABC"] == "B"],
+            [
+                "Q | R = " + pd.Series(R, index=df.index).round(1).astype(str).fillna("nan"),
+                "P | S = " + pd.Series(S, index=df.index).round(1).astype(str).fillna("nan"),
+            ],
+            default="Sin política (C)",
+        )
 
         # ------------------------------
         # DASHBOARD
@@ -138,7 +130,7 @@ if load_button:
             df,
             x="Producto",
             y="Valor_anual",
-            color="ABC",
+            color="Clase_ABC",
             title="Clasificación ABC por Valor Anual"
         )
 
@@ -148,12 +140,12 @@ if load_button:
 
         with col1:
             st.subheader("Distribución ABC")
-            fig_dist = px.histogram(df, x="ABC", color="ABC")
+            fig_dist = px.histogram(df, x="Clase_ABC", color="Clase_ABC")
             st.plotly_chart(fig_dist, use_container_width=True)
 
         with col2:
             st.subheader("Políticas generadas")
-            fig_pol = px.histogram(df, x="Política", color="ABC")
+            fig_pol = px.histogram(df, x="Política", color="Clase_ABC")
             st.plotly_chart(fig_pol, use_container_width=True)
 
         st.subheader("📄 Tabla completa de productos")
@@ -0,0 +1,168 @@
+import streamlit as st
+import plotly.express as px
+
+from inventory_core import (
+    classify_abc,
+    compute_policies,
+    load_sheet,
+    prepare_df,
+    to_excel_bytes,
+)
+
+# ------------------------------
+# CONFIGURACIÓN GENERAL
+# ------------------------------
+st.set_page_config(
+    page_title="Políticas de Inventario ABC",
+    layout="wide"
+)
+
+st.title("📦 Políticas de Inventario – Ventas Diarias + Clasificación ABC")
+
+st.write("""
+Este panel lee la hoja de ventas diarias (columnas Dia_1 … Dia_31), calcula la
+demanda promedio y su variación, clasifica los productos (A/B/C) y genera la
+política de inventario de cada clase: revisión continua (Q) para A, revisión
+periódica (P) para B.
+""")
+
+# ------------------------------
+# SIDEBAR
+# ------------------------------
+
+# Un solo form: editar varios parámetros cuesta un rerun al aplicar, no uno
+# por widget tocado.
+with st.sidebar.form("config"):
+    st.header("🔐 Conexión Google Sheets")
+
+    gsheet_url = st.text_input(
+        "URL de la Google Sheet",
+        placeholder="Pega aquí la URL completa del documento"
+    )
+
+    worksheet_name = st.text_input("Nombre de la hoja", "Sheet1")
+
+    st.header("⚙️ Parámetros")
+
+    a_pct = st.number_input("Corte clase A (%)", 0.50, 0.95, 0.80, 0.05)
+    b_pct = st.number_input("Corte clase B (%)", 0.80, 0.99, 0.95, 0.01)
+
+    service_level_A = st.number_input("Nivel de servicio A", 0.80, 0.999, 0.95, 0.01)
+    service_level_B = st.number_input("Nivel de servicio B", 0.80, 0.999, 0.90, 0.01)
+
+    holding_rate = st.number_input("Tasa de mantener (anual)", 0.05, 1.0, 0.25, 0.05)
+    ordering_cost = st.number_input("Costo de ordenar ($)", 0.0, 1e7, 50000.0, 1000.0)
+    review_period = st.number_input("Periodo de revisión T (días)", 1, 60, 7)
+
+    submitted = st.form_submit_button("📥 Aplicar y cargar")
+
+if submitted and a_pct >= b_pct:
+    st.sidebar.error("El corte de clase A debe ser menor que el de clase B.")
+elif submitted and gsheet_url:
+    st.session_state["config"] = {
+        "gsheet_url": gsheet_url,
+        "worksheet_name": worksheet_name,
+        "a_pct": a_pct,
+        "b_pct": b_pct,
+        "service_level_A": service_level_A,
+        "service_level_B": service_level_B,
+        "holding_rate": holding_rate,
+        "ordering_cost": ordering_cost,
+        "review_period": review_period,
+    }
+
+# ------------------------------
+# DASHBOARD
+# ------------------------------
+
+config = st.session_state.get("config")
+
+if config:
+
+    gsheet_url = config["gsheet_url"]
+    worksheet_name = config["worksheet_name"]
+    a_pct = config["a_pct"]
+    b_pct = config["b_pct"]
+    service_level_A = config["service_level_A"]
+    service_level_B = config["service_level_B"]
+    holding_rate = config["holding_rate"]
+    ordering_cost = config["ordering_cost"]
+    review_period = config["review_period"]
+
+    try:
+        df_raw = load_sheet(gsheet_url, worksheet_name)
+    except Exception as e:
+        st.error(f"Error cargando datos: {e}")
+        st.stop()
+
+    st.success("Datos cargados correctamente.")
+
+    # load_sheet ya devuelve una copia propia (st.cache_data copia al retornar),
+    # así que prepare_df puede mutarla sin duplicarla otra vez.
+    df = prepare_df(df_raw)
+    df_abc = classify_abc(df, a_pct=a_pct, b_pct=b_pct)
+
+    # Un solo value_counts en lugar de tres escaneos booleanos; el total
+    # viene de classify_abc, que ya lo había sumado.
+    counts = df_abc["Clase_ABC"].value_counts()
+    nA, nB, nC = counts.get("A", 0), counts.get("B", 0), counts.get("C", 0)
+    total_value = df_abc.attrs.get("total", df_abc["total_mes"].sum())
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Productos clase A", int(nA))
+    col2.metric("Productos clase B", int(nB))
+    col3.metric("Productos clase C", int(nC))
+    col4.metric("Unidades totales del mes", f"{total_value:,.0f}")
+
+    st.subheader("📊 Clasificación ABC – Volumen Mensual")
+
+    fig_abc = px.bar(
+        df_abc,
+        x="nombre",
+        y="total_mes",
+        color="Clase_ABC",
+        title="Clasificación ABC por unidades vendidas en el mes"
+    )
+    st.plotly_chart(fig_abc, use_container_width=True)
+
+    df_pols = compute_policies(
+        df_abc,
+        service_level_A=service_level_A,
+        service_level_B=service_level_B,
+        holding_rate=holding_rate,
+        ordering_cost=ordering_cost,
+        review_period=review_period,
+    )
+
+    st.subheader("📄 Políticas de inventario por producto")
+
+    show_cols = [
+        "codigo", "nombre", "Clase_ABC", "total_mes", "d_Promedio",
+        "Variacion_D", "Lead_Time_dias", "Política", "Q", "ROP", "SS", "S",
+        "Stock_actual", "Pedido_sugerido", "Alerta",
+    ]
+    show_cols = [c for c in show_cols if c in df_pols.columns]
+
+    df_view = df_pols[show_cols].sort_values(
+        ["Clase_ABC", "total_mes"], ascending=[True, False]
+    )
+
+    # Paginación: al navegador solo viaja la página visible, no la tabla
+    # completa en cada rerun.
+    PAGE_SIZE = 500
+    max_page = max(1, -(-len(df_view) // PAGE_SIZE))
+    page = st.number_input("Página", 1, max_page, 1)
+    st.caption(f"{len(df_view)} productos – página {page} de {max_page}")
+
+    st.dataframe(
+        df_view.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE].fillna(""),
+        use_container_width=True,
+        height=500,
+    )
+
+    st.download_button(
+        "⬇️ Descargar políticas (Excel)",
+        data=to_excel_bytes(df_pols[show_cols]),
+        file_name="politicas_inventario.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )